@@ -7,6 +7,11 @@ API_KEY_ENV_VAR = "GEMINI_API_KEY"
 DOWNLOAD_MAX_RETRIES = 3
 MAX_TOKENS_PER_PROMPT = 4000
 TRANSLATION_INTERVAL_SECONDS = 66
+PROGRESS_FLUSH_INTERVAL_SECONDS = 5
+PROGRESS_FLUSH_MAX_PENDING = 32
+RATE_LIMIT_MAX_RETRIES = 3
+RATE_LIMIT_BACKOFF_BASE_SECONDS = 2
+RATE_LIMIT_BACKOFF_CAP_SECONDS = 60
 
 
 # Logging Configuration
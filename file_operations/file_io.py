@@ -1,14 +1,23 @@
 import logging
+import os
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, Optional, Tuple
 
 from logger import logging_utils
 
+# Directory -> (mtime_ns, .txt files) for directories that were quiet when listed
+_txt_listing_cache: Dict[Path, Tuple[int, Tuple[Path, ...]]] = {}
+# A listing is only reused if the directory was unchanged this long before it was taken, so a
+# change landing within the filesystem's timestamp granularity cannot hide behind an equal mtime
+_LISTING_QUIET_NS = 2_000_000_000
+
 def delete_file(file_path: Path) -> bool:
     """Delete a file, return True if successful, False otherwise."""
     if file_path.exists() and file_path.is_file():
         try:
             file_path.unlink()  # More modern and Pathlib-centric way to delete
+            _txt_listing_cache.pop(file_path.parent, None)
             logging.info(f"Deleted file: {file_path.name}")
             return True
         except Exception as e:
@@ -22,12 +31,30 @@ def save_content_to_file(content: str, file_path: Path) -> Path:
     """Save content to a file, return Path."""
     try:
         file_path.write_text(content, encoding='utf-8')
+        _txt_listing_cache.pop(file_path.parent, None)
         logging.debug(f"File saved: {file_path}")  # Debug level logging
         return file_path
     except Exception as e:
         logging_utils.log_exception(e, f"Error saving file: {file_path}")
         raise  # Re-raise exception after logging
 
+def save_bytes_to_file(data: bytes, file_path: Path) -> Path:
+    """Write already encoded content straight to a file descriptor, skipping the text layer, return Path."""
+    try:
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        _txt_listing_cache.pop(file_path.parent, None)
+        logging.debug(f"File saved: {file_path}")  # Debug level logging
+        return file_path
+    except Exception as e:
+        logging_utils.log_exception(e, f"Error saving file: {file_path}")
+        raise
+
 def load_content_from_file(file_path: Path) -> Optional[str]:
     """Load content from a file, return None if file not found or error."""
     try:
@@ -38,3 +65,28 @@ def load_content_from_file(file_path: Path) -> Optional[str]:
     except Exception as e:
         logging_utils.log_exception(e, f"Error reading file: {file_path}")
         return None
+
+def iter_txt_files(directory: Path) -> Iterator[Path]:
+    """Yield the .txt files in a directory, reading the directory entries directly instead of globbing."""
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".txt") and entry.is_file():
+                    yield Path(entry.path)
+    except FileNotFoundError:
+        return
+
+def list_txt_files(directory: Path) -> Tuple[Path, ...]:
+    """Return the .txt files in a directory, reusing the previous listing while the directory is unchanged."""
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
+        return ()
+    cached = _txt_listing_cache.get(directory)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    files = tuple(iter_txt_files(directory))
+    if time.time_ns() - mtime > _LISTING_QUIET_NS:
+        _txt_listing_cache[directory] = (mtime, files)
+    return files
@@ -4,16 +4,49 @@ import os
 import time
 import portalocker  # Cross-platform file locking
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 
 from logger import logging_utils
 
+try:
+    import orjson  # Much faster (de)serialization of the progress dict
+except ImportError:
+    orjson = None
+
+
+def _loads(text: Union[str, bytes]) -> Dict:
+    """Parse JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _dumps(data: Dict) -> str:
+    """Serialize data to indented JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        # Non-string keys are stringified like json.dumps does, instead of raising
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def load_json_file(file_path: Path) -> Dict:
+    """Read a UTF-8 JSON file, letting orjson parse the raw bytes when it is installed."""
+    return _loads(file_path.read_bytes())
+
+
+def save_json_file(file_path: Path, data: Dict) -> None:
+    """Write data to a JSON file as readable UTF-8, using orjson when it is installed."""
+    if orjson is not None:
+        file_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        file_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+
 
 def _safe_read_json(file_path: Path) -> Optional[Dict]:
     """Safely read a JSON file with file locking."""
     try:
         with portalocker.Lock(file_path, 'r', encoding='utf-8', timeout=10) as f:
-            return json.load(f)
+            return _loads(f.read())
     except portalocker.LockException:
         logging.error(f"Could not acquire lock for reading {file_path}")
         return None
@@ -28,7 +61,7 @@ def _safe_write_json(file_path: Path, data: Dict) -> Optional[bool]:
     try:
         # Write to temporary file first
         with portalocker.Lock(temp_path, 'w', encoding='utf-8', timeout=10) as f:
-            json.dump(data, f, indent=4)
+            f.write(_dumps(data))
             f.flush()
             os.fsync(f.fileno())
 
@@ -27,6 +27,9 @@ IGNORE_WORDS_IN_TRANSLATION = [
     'NỘI DUNG ĐOẠN VĂN'
 ]
 
+_UNDERSCORE_RE = re.compile(r'_\w+_')
+_CHINESE_CHAR_RE = re.compile(r'[\u4e00-\u9fff]')
+
 
 def preprocess_downloaded_text(raw_text: str) -> str:
     """
@@ -65,11 +68,12 @@ def contains_vietnamese(text: str) -> bool:
 
 
 def detect_untranslated_chinese(text: str) -> Tuple[bool, float]:
-    """Detects Chinese characters, returns if present and ratio."""
-    chinese_chars = re.findall(r'[\u4e00-\u9fff]', text)
-    total_chars = len(text)
-    ratio = (len(chinese_chars) / total_chars) * 100 if total_chars > 0 else 0
-    return (len(chinese_chars) > 0), ratio
+    """Detects Chinese characters, returns if present and ratio (as a percentage)."""
+    # Most translations have none, so stop at the first hit before counting them all
+    if not _CHINESE_CHAR_RE.search(text):
+        return False, 0
+    chinese_count = len(_CHINESE_CHAR_RE.findall(text))
+    return True, (chinese_count / len(text)) * 100
 
 
 def split_text_into_chunks(text: str, chunk_size: int) -> List[str]:
@@ -213,24 +217,11 @@ def add_underscore(text, is_chinese=True):
 
 
 def detect_underscore(text):
-    lines = text.splitlines()
-    underscore_pattern = re.compile(r'_\w+_')
-
-    for line in lines:
-        if underscore_pattern.search(line):
-            return True
-
-    return False
+    return bool(_UNDERSCORE_RE.search(text))
 
 def remove_underscore(text: str) -> str:
-    """Normalizes line spacing in a chapter file."""
-    lines = text.splitlines()
-    normalized_lines = []
-    for line in lines:
-        line = line.replace('_', '')
-        normalized_lines.append(line)
-
-    return "\n".join(normalized_lines)
+    """Strips the underscore word separators from a chapter file."""
+    return text.replace('_', '')
 
 
 def translate_long_text(text: str, src: str, dest: str, chunk_size: int = 1024) -> str:
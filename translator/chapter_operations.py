@@ -1,13 +1,39 @@
 import logging
-import re
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Callable
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Callable
 
+from file_operations.file_io import list_txt_files, save_bytes_to_file
 from text_processing.text_processing import split_text_into_chunks, add_underscore
 from translator.helper import is_in_chapter_range
 from config import settings
 
 
+_COPY_BUFFER_SIZE = 1024 * 1024
+_USE_SENDFILE = sys.platform.startswith("linux")  # Elsewhere sendfile only writes to sockets
+_COMBINE_WORKERS = 16
+_LINE_SEPARATOR = os.linesep  # What a text-mode write of "\n" produces, kept for the byte-level writes
+_PROMPT_SEPARATOR = _LINE_SEPARATOR.encode("utf-8")
+
+
+@lru_cache(maxsize=65536)
+def _split_part_name(filename: str) -> Optional[Tuple[str, int]]:
+    """Split a prompt or response name such as "chapter_0001_2.txt" into ("chapter_0001", 2).
+
+    Uses string operations instead of a regex per file; None if the name has no part number.
+    """
+    if not filename.endswith(".txt"):
+        return None
+    chapter_name, _, part = filename[:-len(".txt")].rpartition("_")
+    if chapter_name and part.isdigit():
+        return chapter_name, int(part)
+    return None
+
+
 def is_translation_complete(
         prompts_dir: Path,
         responses_dir: Path,
@@ -20,38 +46,66 @@ def is_translation_complete(
     start_str = str(start_chapter) if start_chapter is not None else 'begin'
     end_str = str(end_chapter) if end_chapter is not None else 'end'
 
-    # Get filtered prompts and responses
-    prompt_files = {
-        p.stem for p in prompts_dir.glob("*.txt")
-        if is_in_chapter_range(p.name, start_chapter, end_chapter)
-    }
+    # Only the responses are collected into a set; the first missing prompt ends the check
+    response_files = {r.name for r in list_txt_files(responses_dir)}
 
-    response_files = {
-        r.stem
-        for r in responses_dir.glob("*.txt")
-        if is_in_chapter_range(r.name, start_chapter, end_chapter)
-    }
+    def prompt_files() -> Iterator[str]:
+        return (p.name for p in list_txt_files(prompts_dir) if is_in_chapter_range(p.name, start_chapter, end_chapter))
 
     # Get failed translations from progress data
     failed_translations = progress_data.get("failed_translations", {})
 
-    untranslated_prompts = set()
-    for prompt_file in prompt_files:
+    def is_untranslated(prompt_file: str) -> bool:
         if prompt_file not in response_files:
-            untranslated_prompts.add(prompt_file)
-        else:
-            failure_info = failed_translations.get(f"{prompt_file}.txt")
-            if failure_info and not failure_info.get("retried", False):
-                untranslated_prompts.add(prompt_file)
-
-    if untranslated_prompts:
-        logging.info(f"Remaining translations in chapters {start_str}-{end_str}: {len(untranslated_prompts)}")
+            return True
+        failure_info = failed_translations.get(prompt_file)
+        return bool(failure_info and not failure_info.get("retried", False))
+
+    first_missing = next((prompt_file for prompt_file in prompt_files() if is_untranslated(prompt_file)), None)
+    if first_missing is not None:
+        logging.info(f"Translation incomplete for chapters {start_str}-{end_str} (first missing: {first_missing})")
+        # Counting every remaining prompt is only worth it when debugging
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            remaining = sum(1 for prompt_file in prompt_files() if is_untranslated(prompt_file))
+            logging.debug(f"Remaining translations in chapters {start_str}-{end_str}: {remaining}")
         return False
 
     logging.info(f"All translations completed for chapters {start_str}-{end_str}")
     return True
 
 
+def _append_file(infile: BinaryIO, outfile: BinaryIO) -> None:
+    """Copy the whole of infile to the end of outfile, inside the kernel where sendfile works on regular files."""
+    if not _USE_SENDFILE:
+        shutil.copyfileobj(infile, outfile, _COPY_BUFFER_SIZE)
+        return
+
+    outfile.flush()  # sendfile writes at the descriptor's position, behind the buffer
+    in_fd, out_fd = infile.fileno(), outfile.fileno()
+    offset, size = 0, os.fstat(in_fd).st_size
+    while offset < size:
+        sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
+
+
+def _combine_chapter(files: List[Path], output_path: Path) -> None:
+    """Concatenate the translated prompt files of one chapter into output_path."""
+    try:
+        # Responses are already UTF-8, so stream the bytes instead of decoding and re-encoding them
+        with open(output_path, "wb") as outfile:
+            for file_path in files:
+                try:
+                    with open(file_path, "rb") as infile:
+                        _append_file(infile, outfile)
+                    outfile.write(_PROMPT_SEPARATOR)  # Add newline between prompts
+                except Exception as e:
+                    logging.error(f"Error reading file {file_path}: {e}")
+    except OSError as e:
+        logging.error(f"Error writing to {output_path}: {e}")
+
+
 def combine_translations(
         translated_responses_dir: Path,
         translated_chapters_dir: Path,
@@ -60,36 +114,31 @@ def combine_translations(
 ) -> None:
     """Combines translated prompt files for each chapter."""
     response_files = [
-        p for p in translated_responses_dir.glob("*.txt")
+        p for p in list_txt_files(translated_responses_dir)
         if is_in_chapter_range(p.name, start_chapter, end_chapter)
     ]
 
     chapter_files = {}
     for filename in response_files:
-        match = re.match(r"(.*)_\d+\.txt", filename.name)
-        if match:
-            chapter_name = match.group(1)
-            if chapter_name not in chapter_files:
-                chapter_files[chapter_name] = []
-            chapter_files[chapter_name].append(filename)
-
-    # Combine files for each chapter
-    for chapter_name in sorted(chapter_files.keys()):
-        # Optionally, sort the files for each chapter
-        files = sorted(chapter_files[chapter_name])
-
-        output_path = translated_chapters_dir / f"{chapter_name}.txt"
-        try:
-            with open(output_path, "w", encoding="utf-8") as outfile:
-                for file_path in files:
-                    try:
-                        with open(file_path, "r", encoding="utf-8") as infile:
-                            content = infile.read()
-                            outfile.write(content + "\n")  # Add newline between prompts
-                    except Exception as e:
-                        logging.error(f"Error reading file {file_path}: {e}")
-        except OSError as e:
-            logging.error(f"Error writing to {output_path}: {e}")
+        name_parts = _split_part_name(filename.name)
+        if name_parts:
+            chapter_name, part = name_parts
+            chapter_files.setdefault(chapter_name, []).append((part, filename))
+
+    # Chapters are written to separate files, so they can be combined concurrently
+    with ThreadPoolExecutor(max_workers=_COMBINE_WORKERS) as executor:
+        futures = {}
+        for chapter_name, parts in chapter_files.items():
+            # Order parts numerically, so part 10 follows part 9 rather than part 1
+            files = [filename for _, filename in sorted(parts)]
+            output_path = translated_chapters_dir / f"{chapter_name}.txt"
+            futures[executor.submit(_combine_chapter, files, output_path)] = output_path
+
+        for future, output_path in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Error combining {output_path}: {e}")
 
     logging.info("Combine chapter translations complete")
 
@@ -98,7 +147,6 @@ def create_prompt_files(
         download_dir: Path,
         prompt_dir: Path,
         load_content_from_file: Callable,
-        save_content_to_file: Callable,
         start_chapter: Optional[int] = None,
         end_chapter: Optional[int] = None
 ) -> None:
@@ -107,7 +155,7 @@ def create_prompt_files(
     new_chapter_count = 0
 
     chapter_files = [
-        p for p in download_dir.glob("*.txt")
+        p for p in list_txt_files(download_dir)
         if is_in_chapter_range(p.name, start_chapter, end_chapter)
     ]
     if not chapter_files:
@@ -116,11 +164,11 @@ def create_prompt_files(
 
     # Get existing prompt file prefixes (chapter names)
     existing_prompts = set()
-    for prompt_file in prompt_dir.glob("*.txt"):
+    for prompt_file in list_txt_files(prompt_dir):
         # Extract chapter name from prompt filename (e.g., "chapter_0001_1.txt" -> "chapter_0001")
-        match = re.match(r"(.*)_\d+\.txt", prompt_file.name)
-        if match:
-            existing_prompts.add(match.group(1))
+        name_parts = _split_part_name(prompt_file.name)
+        if name_parts:
+            existing_prompts.add(name_parts[0])
 
     for chapter_file in chapter_files:
         # Skip if this chapter already has prompt files
@@ -133,8 +181,12 @@ def create_prompt_files(
             new_chapter_count += 1
             prompts = split_text_into_chunks(chapter_text, settings.MAX_TOKENS_PER_PROMPT)
             for idx, prompt_text in enumerate(prompts):
-                prompt_filename = f"{chapter_file.stem}_{idx + 1}.txt"
-                save_content_to_file(add_underscore(prompt_text), prompt_filename, "prompt_files")
+                prompt_path = prompt_dir / f"{chapter_file.stem}_{idx + 1}.txt"
+                # A chapter can produce many shards, so write the encoded bytes without the text-file layer
+                shard_text = add_underscore(prompt_text)
+                if _LINE_SEPARATOR != "\n":
+                    shard_text = shard_text.replace("\n", _LINE_SEPARATOR)
+                save_bytes_to_file(shard_text.encode("utf-8"), prompt_path)
                 prompt_count += 1
 
     if new_chapter_count > 0:
@@ -158,22 +210,22 @@ def get_chapters_status(
 
     # Get all prompt files in the specified range
     prompt_files = [
-        p for p in prompts_dir.glob("*.txt")
+        p for p in list_txt_files(prompts_dir)
         if is_in_chapter_range(p.name, start_chapter, end_chapter)
     ]
 
     # Get all response files in the specified range
     response_files = [
-        r for r in responses_dir.glob("*.txt")
+        r for r in list_txt_files(responses_dir)
         if is_in_chapter_range(r.name, start_chapter, end_chapter)
     ]
 
     # Group prompt files by chapter
     chapter_status = {}
     for file_path in prompt_files:
-        match = re.match(r"(.*)_\d+\.txt", file_path.name)
-        if match:
-            chapter_name = match.group(1)
+        name_parts = _split_part_name(file_path.name)
+        if name_parts:
+            chapter_name = name_parts[0]
             if chapter_name not in chapter_status:
                 chapter_status[chapter_name] = {
                     "total_shards": 0,
@@ -189,9 +241,9 @@ def get_chapters_status(
     progress_data = load_progress()
     if "failed_translations" in progress_data:
         for filename, failure_info in progress_data["failed_translations"].items():
-            match = re.match(r"(.*)_\d+\.txt", filename)
-            if match:
-                chapter_name = match.group(1)
+            name_parts = _split_part_name(filename)
+            if name_parts:
+                chapter_name = name_parts[0]
                 if chapter_name in chapter_status:
                     # Count as failed shard
                     chapter_status[chapter_name]["failed_shards"] += 1
@@ -201,23 +253,22 @@ def get_chapters_status(
                     chapter_status[chapter_name]["error"] = failure_info.get("error", "Unknown error")
 
     # Then count translated and failed shards from files
+    failed_translations = progress_data.get("failed_translations", {})
     for file_path in response_files:
-        match = re.match(r"(.*)_\d+\.txt", file_path.name)
-        if match:
-            chapter_name = match.group(1)
+        name_parts = _split_part_name(file_path.name)
+        if name_parts:
+            chapter_name = name_parts[0]
             if chapter_name in chapter_status:
                 content = load_content_from_file(file_path.name, "translation_responses")
                 if content:
                     if "[TRANSLATION FAILED]" in content:
                         # Only count as failed if not already counted from progress.json
-                        if not any(filename == file_path.name for filename in
-                                   progress_data.get("failed_translations", {})):
+                        if file_path.name not in failed_translations:
                             chapter_status[chapter_name]["failed_shards"] += 1
                             chapter_status[chapter_name]["failed"] = True
                     else:
                         # Only count as translated if not marked as failed in progress.json
-                        if not any(filename == file_path.name for filename in
-                                   progress_data.get("failed_translations", {})):
+                        if file_path.name not in failed_translations:
                             chapter_status[chapter_name]["translated_shards"] += 1
 
     # Calculate progress and set status for each chapter
@@ -3,7 +3,7 @@ import logging
 import re
 from threading import Lock
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from config import settings
 from config.models import ModelConfig
@@ -18,11 +18,16 @@ from text_processing.text_processing import sanitize_path_name
 from translator import chapter_operations
 
 
+# Repeated special characters (100+ consecutive) or repeated words (20+ consecutive repeats), found in one scan
+_REPETITION_RE = re.compile(r'(?P<special_chars>[_\-=]{100,})|(?P<word>\b\w+\b)(?:\W+(?P=word)){20,}', re.IGNORECASE)
+
+
 class FileHandler:
     """Handles file operations: creation, loading, saving, path management."""
 
     def __init__(self, book_dir: Path):
         self.book_dir = book_dir
+        self._paths: Dict[str, Path] = {}  # Sub directory paths, built once per key
         self._ensure_directory_structure()
         self._progress_lock = Lock()  # Lock for progress file operations
 
@@ -38,7 +43,10 @@ class FileHandler:
 
     def get_path(self, key: str) -> Path:
         """Retrieve a path object for a given key."""
-        return self.book_dir.joinpath(key)
+        path = self._paths.get(key)
+        if path is None:
+            path = self._paths[key] = self.book_dir.joinpath(key)
+        return path
 
     def delete_file(self, filename: str, sub_dir_key: str) -> bool:
         """Delete a specific file, return True if successful, False otherwise."""
@@ -51,6 +59,13 @@ class FileHandler:
         with self._progress_lock:
             return json_operations.load_progress_file(progress_file_path)
 
+    def get_progress_mtime(self) -> Optional[int]:
+        """Return the modification time of progress.json in nanoseconds, None if it doesn't exist."""
+        try:
+            return self._get_progress_path().stat().st_mtime_ns
+        except OSError:
+            return None
+
     def save_progress(self, progress_data: Dict) -> None:
         """Save progress data to progress.json with proper locking."""
         progress_file_path = self._get_progress_path()
@@ -95,7 +110,6 @@ class FileHandler:
             self.get_path("input_chapters"),
             self.get_path("prompt_files"),
             self.load_content_from_file,
-            self.save_content_to_file,
             start_chapter,
             end_chapter
         )
@@ -104,11 +118,36 @@ class FileHandler:
         """Load content of a prompt file, return None if not found."""
         return self.load_content_from_file(prompt_filename, "prompt_files")
 
+    @staticmethod
+    def get_invalid_translation_reasons(content: str, original_content: str) -> List[str]:
+        """Return why a translation looks invalid compared to its prompt, empty if it looks fine.
+
+        Checks run cheapest first and stop at the first one that fires, so the regexes
+        only scan translations that passed the line and length checks.
+        """
+        content_lines = len(content.splitlines())
+        original_lines = len(original_content.splitlines())
+
+        # Check 1: Short content (<=1 line)
+        if content_lines <= 1 and original_lines >= 5:
+            return ["Short content"]
+
+        # Check 2: Very low content to prompt ratio
+        if len(content) < len(original_content) * 0.3 and content_lines < original_lines * 0.5:
+            return ["Suspicious length ratio"]
+
+        # Checks 3 and 4: Repeated special characters or repeated words, in a single pass over the text
+        match = _REPETITION_RE.search(content)
+        if match:
+            return ["Repeated special characters" if match.group('special_chars') else "Repeated words"]
+
+        return []
+
     def delete_invalid_translations(self) -> int:
         """Deletes very short translation files, likely errors, returns count deleted."""
         deleted_count = 0
         responses_dir = self.get_path("translation_responses")
-        files_to_check = responses_dir.glob("*.txt")
+        files_to_check = list(file_io.iter_txt_files(responses_dir))  # Files are deleted while checking
 
         for file_path in files_to_check:
             try:
@@ -128,25 +167,7 @@ class FileHandler:
                         logging.warning(f"Deleted translation with no prompt: {file_path.name}")
                     continue
 
-                reasons = []
-
-                # Check 1: Short content (<=1 line)
-                if len(content.splitlines()) <= 1 and len(original_content.splitlines()) >= 5:
-                    reasons.append("Short content")
-
-                # Check 2: Repeated words (20+ consecutive repeats)
-                if re.search(r'(\b\w+\b)(\W+\1){20,}', content, flags=re.IGNORECASE):
-                    reasons.append("Repeated words")
-
-                # Check 3: Repeated special characters (100+ consecutive)
-                if re.search(r'[_\-=]{100,}', content):
-                    reasons.append("Repeated special characters")
-
-                # Check 4: Very low content to prompt ratio
-                if len(content) < len(original_content) * 0.3 and len(content.splitlines()) < len(
-                        original_content.splitlines()) * 0.5:
-                    reasons.append("Suspicious length ratio")
-
+                reasons = self.get_invalid_translation_reasons(content, original_content)
                 if reasons:
                     if self.delete_file(file_path.name, "translation_responses"):
                         deleted_count += 1
@@ -175,7 +196,7 @@ class FileHandler:
         logging.info("Extracting Chinese sentences from translation responses...")
 
         translation_dir = self.get_path("translation_responses")
-        translation_files = list(translation_dir.glob("*.txt"))
+        translation_files = list(file_io.iter_txt_files(translation_dir))
 
         if not translation_files:
             logging.warning("No translation files found for Chinese sentence extraction.")
@@ -238,8 +259,7 @@ class FileHandler:
 
 
             # Save to file
-            with open(output_filepath, "w", encoding="utf-8") as outfile:
-                json.dump(result, outfile, ensure_ascii=False, indent=2)
+            json_operations.save_json_file(output_filepath, result)
 
             logging.info(f"Chinese sentences extracted and translated to: {output_filepath}")
             return True, output_filepath
@@ -268,8 +288,7 @@ class FileHandler:
 
         try:
             # Load the Chinese-Vietnamese mapping
-            with open(chinese_sentences_file, "r", encoding="utf-8") as f:
-                chinese_vietnamese_map = json.load(f)
+            chinese_vietnamese_map = json_operations.load_json_file(chinese_sentences_file)
 
             if not chinese_vietnamese_map:
                 logging.warning("Chinese sentences mapping is empty. Skipping replacement.")
@@ -279,7 +298,7 @@ class FileHandler:
 
             # Process all chapter files
             translated_responses_dir = self.get_path("translation_responses")
-            translated_files = list(translated_responses_dir.glob("*.txt"))
+            translated_files = list(file_io.iter_txt_files(translated_responses_dir))
 
             if not translated_files:
                 logging.warning("No translated response files found to process.")
@@ -315,7 +334,7 @@ class FileHandler:
     def generate_epub(self, book_title: str, book_author: str, cover_image: str) -> Optional[Path]:
         """Generate EPUB from combined translations, return path to EPUB or None on failure."""
         translated_chapters_dir = self.get_path("translated_chapters")
-        chapter_files = sorted(translated_chapters_dir.glob("*.txt"))
+        chapter_files = sorted(file_io.iter_txt_files(translated_chapters_dir))
 
         if not chapter_files:
             logging.warning("No translated files found to create EPUB.")
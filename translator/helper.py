@@ -1,5 +1,9 @@
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
+
+_RETRY_DELAY_RE = re.compile(r'retry_delay\s*\{\s*seconds:\s*(\d+)')
+_CHAPTER_NUMBER_RE = re.compile(r'\d+')
 
 def is_in_chapter_range(
     filename: str,
@@ -16,8 +20,26 @@ def is_in_chapter_range(
 
     return lower_bound <= chapter_num <= upper_bound
 
+@lru_cache(maxsize=65536)
+def extract_name_numbers(filename: str) -> Tuple[int, ...]:
+    """Extract all numbers from filename in order, e.g. (chapter, shard).
+
+    Cached because the same names are parsed on every listing, range check and sort.
+    """
+    return tuple(int(n) for n in _CHAPTER_NUMBER_RE.findall(filename))
+
+@lru_cache(maxsize=65536)
 def extract_chapter_number(filename: str) -> Optional[int]:
     """Extract chapter number from filename using regex."""
-    match = re.search(r'\d+', filename)
+    match = _CHAPTER_NUMBER_RE.search(filename)
     return int(match.group()) if match else None
 
+
+def extract_retry_delay(error_message: str) -> Optional[int]:
+    """Extract the server-suggested retry delay in seconds from a 429 error message."""
+    match = _RETRY_DELAY_RE.search(error_message)
+    return int(match.group(1)) if match else None
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check if an API error means the quota is exhausted (HTTP 429)."""
+    return getattr(error, "code", None) == 429 or "429" in str(error)
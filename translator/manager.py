@@ -1,9 +1,11 @@
 import concurrent
 import logging
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
-from typing import Dict, List, Optional, Any
+import random
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from itertools import islice
+from threading import Event, Lock
+from typing import Dict, Iterator, List, Optional, Any, Sequence
 
 from google.generativeai import GenerativeModel
 
@@ -11,6 +13,7 @@ from config import settings
 from config.models import ModelConfig
 from config.prompts import PromptStyle
 from translator.file_handler import FileHandler
+from translator.helper import extract_retry_delay, is_rate_limit_error
 from text_processing.text_processing import normalize_translation, detect_untranslated_chinese
 from translator.model import ModelManager
 from translator.progress import ProgressTracker, TaskManager, RateLimiter
@@ -35,7 +38,15 @@ class TranslationManager:
         self.task_manager = TaskManager(self.file_handler)
         self.prompt_builder = PromptBuilder()
         self.rate_limiter = RateLimiter()
-        self._stop_requested = False  # Cancellation flag
+        self.rate_limiter.register_model(self.model_manager.primary_model.model_name,
+                                         self.model_manager.primary_batch_size)
+        self.rate_limiter.register_model(self.model_manager.lite_model.model_name,
+                                         self.model_manager.lite_batch_size)
+        self.rate_limiter.register_model(self.model_manager.pro_model.model_name,
+                                         self.model_manager.pro_batch_size)
+        self._executors: Dict[str, ThreadPoolExecutor] = {}  # Long-lived worker pools per model
+        self._executors_lock = Lock()  # stop() shuts the pools down from another thread
+        self._stop_event = Event()  # Set by stop() to cancel the translation
 
     def translate_book(
             self,
@@ -46,12 +57,13 @@ class TranslationManager:
         """Main method to handle the book translation process."""
         logging.info("Starting translation process for: %s (chapters %s-%s)",
                      self.file_handler.book_dir, start_chapter or 'begin', end_chapter or 'end')
-        self._stop_requested = False
+        prompt_style = PromptStyle(prompt_style)  # Callers such as the GUI may pass the raw enum value
+        self._stop_event.clear()
 
-        while not self._stop_requested and not self.file_handler.is_translation_complete(start_chapter, end_chapter):
+        while not self._stop_event.is_set() and not self.file_handler.is_translation_complete(start_chapter, end_chapter):
             self._process_translation_phases(prompt_style, start_chapter, end_chapter)
             
-            if self._stop_requested:
+            if self._stop_event.is_set():
                 logging.info("Translation process was cancelled by the user.")
                 break
 
@@ -66,13 +78,17 @@ class TranslationManager:
             end_chapter: Optional[int]
     ) -> None:
         """Process all phases of translation including regular, Chinese-specific, and failed retries."""
+        # progress.json may have been changed since the last pass
+        self.progress_tracker.reload_progress()
+
         # Process regular translation tasks
         logging.info("--- Processing regular translation tasks ---")
         futures = self._process_regular_translation_batch(
             prompt_style, start_chapter, end_chapter, 
             self.model_manager.primary_batch_size
         )
-        concurrent.futures.wait(futures)
+        self._wait_for_futures(futures)
+        self.progress_tracker.flush_progress()
 
         # Process Chinese-specific retries
         logging.info("--- Processing Chinese character specific retries ---")
@@ -80,7 +96,8 @@ class TranslationManager:
            start_chapter, end_chapter,
             self.model_manager.lite_batch_size
         )
-        concurrent.futures.wait(futures)
+        self._wait_for_futures(futures)
+        self.progress_tracker.flush_progress()
 
         # Process regular failed translation retries
         logging.info("--- Processing failed translation retries (regular failures) ---")
@@ -88,15 +105,30 @@ class TranslationManager:
             prompt_style, start_chapter, end_chapter, 
             self.model_manager.pro_batch_size, is_retry=True
         )
-        concurrent.futures.wait(futures)
+        self._wait_for_futures(futures)
+        self.progress_tracker.flush_progress()
+
+    def _wait_for_futures(self, futures: List[concurrent.futures.Future]) -> None:
+        """Wait for the futures to finish, returning as soon as stop() is called."""
+        not_done = set(futures)
+        while not_done:
+            _, not_done = concurrent.futures.wait(not_done, timeout=1.0, return_when=FIRST_COMPLETED)
+            if self._stop_event.is_set():
+                for future in not_done:
+                    future.cancel()
+                break
 
     def _perform_post_processing(self) -> None:
         """Perform post-processing tasks after each translation phase."""
+        self.progress_tracker.flush_progress()
         self.file_handler.delete_invalid_translations()
 
     def _finalize_translation(self, start_chapter: Optional[int], end_chapter: Optional[int]) -> None:
         """Finalize the translation process by combining chapters."""
-        if not self._stop_requested:
+        # After a normal run every phase has been waited for, so joining the workers is immediate
+        self._shutdown_executors(wait=not self._stop_event.is_set())
+        self.progress_tracker.clear_progress()
+        if not self._stop_event.is_set():
             self.file_handler.combine_chapter_translations(start_chapter=start_chapter, end_chapter=end_chapter)
             logging.info("Translation process completed for: %s", self.file_handler.book_dir)
         else:
@@ -111,163 +143,243 @@ class TranslationManager:
         is_retry: bool = False,
     ) -> List[concurrent.futures.Future]:
         """Process a batch of regular translation tasks."""
-        executor = ThreadPoolExecutor(max_workers=batch_size)
-        futures = []
-        
-        tasks = self._prepare_regular_tasks(start_chapter, end_chapter, is_retry)
-        if not tasks:
-            logging.info("No tasks to process")
-            return futures
+        model = self.model_manager.select_model_for_task(is_retry)
+        executor = self._get_executor(model.model_name, batch_size)
+        if executor is None:
+            return []
 
+        tasks = self._prepare_regular_tasks(start_chapter, end_chapter, is_retry)
         progress_data = self.progress_tracker.load_progress()
-        retry_lock = Lock()  # Use retry_lock directly in this method like original code
 
         batch_index = 0
-        while tasks and not self._stop_requested:
-            batch = self._prepare_batch(tasks, batch_size, is_retry, start_chapter, end_chapter)
+        in_flight = set()
+        while not self._stop_event.is_set():
+            batch = list(islice(tasks, batch_size))
             if not batch:
                 break
 
-            model = self.model_manager.select_model_for_task(is_retry)
-            futures.extend(self._submit_batch_tasks(
-                executor, batch, progress_data, 
-                retry_lock, prompt_style, is_retry, batch_index, 
-                model.model_name
-            ))
+            # Queue at most one batch ahead of the running one, so prompt contents
+            # are held in memory only shortly before they are translated
+            while len(in_flight) > batch_size and not self._stop_event.is_set():
+                _, in_flight = concurrent.futures.wait(in_flight, timeout=1.0, return_when=FIRST_COMPLETED)
+            if self._stop_event.is_set():
+                break
+
+            batch_futures = self._submit_batch_tasks(
+                executor, batch, progress_data,
+                prompt_style, is_retry, batch_index
+            )
+            in_flight.update(batch_futures)
             batch_index += 1
 
-        executor.shutdown(wait=False)
-        return futures
+        if batch_index == 0:
+            logging.info("No tasks to process")
+        # Finished futures were already pruned from in_flight, only the rest needs waiting for
+        return list(in_flight)
+
+    def _get_executor(self, model_name: str, max_workers: int) -> Optional[ThreadPoolExecutor]:
+        """Return the long-lived worker pool for a model, creating it on first use.
+
+        Each model keeps its own pool so a phase never runs more requests at once
+        than that model's batch size, while threads are reused across batches and phases.
+        Returns None once stop() was called, so no pool is created after the shutdown.
+        """
+        with self._executors_lock:
+            if self._stop_event.is_set():
+                return None
+            executor = self._executors.get(model_name)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"translate-{model_name}")
+                self._executors[model_name] = executor
+            return executor
+
+    def _submit(self, executor: ThreadPoolExecutor, fn, *args, **kwargs) -> Optional[concurrent.futures.Future]:
+        """Submit work to a pool, returning None if stop() shut the pool down in the meantime."""
+        try:
+            return executor.submit(fn, *args, **kwargs)
+        except RuntimeError:
+            if self._stop_event.is_set():
+                return None
+            raise
+
+    def _shutdown_executors(self, wait: bool = False) -> None:
+        """Shut down all worker pools, dropping any tasks that have not started yet.
+
+        With wait=True the worker threads are joined, so no call outlives the run.
+        """
+        with self._executors_lock:
+            executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+        self.task_manager.shutdown_io(wait=wait)
 
     def _prepare_regular_tasks(
             self,
             start_chapter: Optional[int] = None,
             end_chapter: Optional[int] = None,
             is_retry: bool = False
-    ) -> List[TranslationTask]:
+    ) -> Iterator[TranslationTask]:
         """Prepare regular translation tasks based on whether it's a retry or not."""
         if is_retry:
-            return self.task_manager.prepare_retry_tasks(start_chapter, end_chapter)
+            progress_data = self.progress_tracker.load_progress()
+            return iter(self.task_manager.prepare_retry_tasks(progress_data, start_chapter, end_chapter))
         return self.task_manager.prepare_new_tasks(start_chapter, end_chapter)
 
-    def _prepare_batch(
-            self,
-            tasks: List[TranslationTask],
-            batch_size: int,
-            is_retry: bool,
-            start_chapter: Optional[int],
-            end_chapter: Optional[int]
-    ) -> List[TranslationTask]:
-        """Prepare a batch of tasks for processing."""
-        progress_data = self.progress_tracker.load_progress()
-        model = self.model_manager.select_model_for_task(is_retry)
-        self.rate_limiter.enforce_rate_limit(progress_data, len(tasks), batch_size, model.model_name)
-        
-        batch = tasks[:batch_size]
-        
-        if not is_retry and self.task_manager.has_processed_tasks(batch):
-            tasks = self.task_manager.prepare_new_tasks(start_chapter, end_chapter)
-            batch = tasks[:batch_size]
-            
-        tasks[:] = tasks[batch_size:]  # Remove processed tasks
-        return batch
-
     def _submit_batch_tasks(
             self,
             executor: ThreadPoolExecutor,
             batch: List[TranslationTask],
             progress_data: Dict,
-            retry_lock: Lock,
             prompt_style: PromptStyle,
             is_retry: bool,
             batch_index: int,
-            model_name: str
     ) -> List[concurrent.futures.Future]:
         """Submit a batch of tasks for processing."""
         logging.info("Processing batch %d with %d tasks", batch_index+1, len(batch))
-        logging.info(f"Tasks in this batch: {[task.filename for task in batch]}")
-
-        batch_futures = [
-            executor.submit(
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Tasks in this batch: %s", [task.filename for task in batch])
+
+        # Tasks with identical content share one API call
+        groups: Dict[str, List[TranslationTask]] = {}
+        for task in batch:
+            groups.setdefault(task.content, []).append(task)
+
+        batch_futures = []
+        for tasks in groups.values():
+            future = self._submit(
+                executor,
                 self._process_regular_task,
-                task,
+                tasks[0],
                 progress_data,
-                retry_lock,
                 prompt_style,
                 is_retry,
+                tasks[1:],
             )
-            for task in batch
-        ]
-
-        # Update model-specific rate limiting information
-        model_rate_limits = progress_data.get("model_rate_limits", {})
-        if model_name not in model_rate_limits:
-            model_rate_limits[model_name] = {"last_batch_time": 0, "last_batch_size": 0}
-        
-        model_rate_limits[model_name].update({
-            "last_batch_time": time.time(),
-            "last_batch_size": len(batch)
-        })
-        progress_data["model_rate_limits"] = model_rate_limits
-        self.progress_tracker.save_progress(progress_data)
-
+            if future is None:
+                break
+            batch_futures.append(future)
         return batch_futures
 
     def _process_regular_task(
             self,
             task: TranslationTask,
             progress_data: Dict,
-            retry_lock: Lock,
             prompt_style: PromptStyle,
             is_retry: bool = False,
+            duplicates: Sequence[TranslationTask] = (),
     ) -> None:
-        """Process a single regular translation task."""
-        if self._stop_requested:
+        """Process a single regular translation task, applying the result to any duplicates of it."""
+        if self._stop_event.is_set():
             logging.info("Translation task %s cancelled.", task.filename)
             return
-            
+
+        # Select appropriate model
+        model = self.model_manager.select_model_for_task(is_retry)
+        if not self._acquire_request_slot(model.model_name):
+            logging.info("Translation task %s cancelled.", task.filename)
+            return
+
+        if duplicates:
+            logging.info(f"Reusing the translation of {task.filename} for {[t.filename for t in duplicates]}")
+
         try:
-            # Select appropriate model
-            model = self.model_manager.select_model_for_task(is_retry)
-            
             # Translate the content
-            translated_text = self._translate(model, task.content, None, prompt_style)
-            
-            if translated_text:
-                # Handle Chinese characters if present
-                has_chinese, ratio = detect_untranslated_chinese(translated_text)
-                
-                if not has_chinese or ratio <= 0.5:
-                    # No Chinese characters or negligible amount - handle as success
-                    self.progress_tracker.handle_translation_success(task, translated_text, progress_data)
-                elif has_chinese and ratio <= 20:
-                    # Some Chinese characters (≤20%) - store content but mark as failed
-                    logging.warning(f"Text contains Chinese characters ({ratio:.2f}%) but ratio ≤ 20% for {task.filename}")
-                    self.file_handler.save_content_to_file(translated_text, task.filename, "translation_responses")
-                    self.progress_tracker.mark_translation_failed(
-                        task.filename, 
-                        f"ERROR:partial_chinese, translation contains partial chinese with ratio: ({ratio:.2f}%)",
-                        progress_data,
-                        store_failure_marker=False
-                    )
-                else:
-                    # Excessive Chinese characters - create failure marker
-                    error_msg = f"ERROR:exceeds_chinese, translation contains chinese with ratio: ({ratio:.2f}%)"
-                    logging.error(f"Text contains excessive Chinese characters ({ratio:.2f}%) for {task.filename}")
-                    self.progress_tracker.mark_translation_failed(task.filename, error_msg, progress_data, is_retry)
-            else:
-                # Handle translation error
-                error_msg = "Empty translation result"
-                logging.error(f"Error processing {task.filename}: {error_msg}")
-                if not ("429" in error_msg or "504" in error_msg):
-                    self.progress_tracker.mark_translation_failed(task.filename, error_msg.lower(), progress_data, is_retry)
-                
+            translated_text = self._translate_with_backoff(model, task.content, prompt_style)
         except Exception as e:
-            # Handle exceptions
-            error_message = f"Error translating {task.filename}: {str(e)}"
-            logging.error(error_message)
-            if not ("429" in str(e) or "504" in str(e)):
-                self.progress_tracker.mark_translation_failed(task.filename, str(e).lower(), progress_data)
+            for failed_task in (task, *duplicates):
+                # Handle exceptions
+                error_message = f"Error translating {failed_task.filename}: {str(e)}"
+                logging.error(error_message)
+                if not is_rate_limit_error(e) and "504" not in str(e):
+                    self.progress_tracker.mark_translation_failed(failed_task.filename, str(e).lower(), progress_data)
+            return
+
+        for result_task in (task, *duplicates):
+            try:
+                self._handle_regular_result(result_task, translated_text, progress_data, is_retry)
+            except Exception as e:
+                logging.error(f"Error translating {result_task.filename}: {str(e)}")
+                self.progress_tracker.mark_translation_failed(result_task.filename, str(e).lower(), progress_data)
+
+    def _handle_regular_result(
+            self,
+            task: TranslationTask,
+            translated_text: Optional[str],
+            progress_data: Dict,
+            is_retry: bool,
+    ) -> None:
+        """Save or reject the model output for a regular translation task."""
+        if translated_text:
+            # Validate right away instead of saving a response that post-processing would delete
+            reasons = self.file_handler.get_invalid_translation_reasons(translated_text, task.content)
+            if reasons:
+                logging.warning(f"Discarded likely invalid translation: {task.filename} (Reasons: {', '.join(reasons)}).")
+                return
+
+            # Handle Chinese characters if present
+            has_chinese, ratio = detect_untranslated_chinese(translated_text)
+
+            if not has_chinese or ratio <= 0.5:
+                # No Chinese characters or negligible amount - handle as success
+                self.progress_tracker.handle_translation_success(task, translated_text, progress_data)
+            elif has_chinese and ratio <= 20:
+                # Some Chinese characters (≤20%) - store content but mark as failed
+                logging.warning(f"Text contains Chinese characters ({ratio:.2f}%) but ratio ≤ 20% for {task.filename}")
+                self.file_handler.save_content_to_file(translated_text, task.filename, "translation_responses")
+                self.progress_tracker.mark_translation_failed(
+                    task.filename, 
+                    f"ERROR:partial_chinese, translation contains partial chinese with ratio: ({ratio:.2f}%)",
+                    progress_data,
+                    store_failure_marker=False
+                )
+            else:
+                # Excessive Chinese characters - create failure marker
+                error_msg = f"ERROR:exceeds_chinese, translation contains chinese with ratio: ({ratio:.2f}%)"
+                logging.error(f"Text contains excessive Chinese characters ({ratio:.2f}%) for {task.filename}")
+                self.progress_tracker.mark_translation_failed(task.filename, error_msg, progress_data, is_retry)
+        else:
+            # Handle translation error
+            error_msg = "Empty translation result"
+            logging.error(f"Error processing {task.filename}: {error_msg}")
+            if not ("429" in error_msg or "504" in error_msg):
+                self.progress_tracker.mark_translation_failed(task.filename, error_msg.lower(), progress_data, is_retry)
+
+    def _acquire_request_slot(self, model_name: str) -> bool:
+        """Wait for the model's rate limiter, return False if translation was stopped meanwhile."""
+        return self.rate_limiter.acquire(model_name, self._stop_event) and not self._stop_event.is_set()
+
+    def _translate_with_backoff(
+            self,
+            model: GenerativeModel,
+            raw_text: str,
+            prompt_style: PromptStyle
+    ) -> Optional[str]:
+        """Translate text, retrying rate-limited calls after a pause.
+
+        Every 429 drains the model's rate limiter exactly once, here: for the delay the server
+        asked for, or else for an exponential backoff with jitter. The retry then only waits
+        for that pause through the rate limiter, which also holds back the model's other workers.
+        """
+        for attempt in range(settings.RATE_LIMIT_MAX_RETRIES + 1):
+            try:
+                return self._translate(model, raw_text, None, prompt_style)
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                delay = extract_retry_delay(str(e))
+                if delay is None:
+                    # Jitter keeps workers that were throttled together from retrying in lockstep
+                    delay = min(settings.RATE_LIMIT_BACKOFF_CAP_SECONDS,
+                                settings.RATE_LIMIT_BACKOFF_BASE_SECONDS * 2 ** attempt)
+                    delay += random.uniform(0, settings.RATE_LIMIT_BACKOFF_BASE_SECONDS)
+                self.rate_limiter.drain(model.model_name, delay)
+                if attempt == settings.RATE_LIMIT_MAX_RETRIES:
+                    raise
+                logging.warning("Rate limited on %s, retrying in %.1fs (attempt %d/%d)",
+                                model.model_name, delay, attempt + 1, settings.RATE_LIMIT_MAX_RETRIES)
+                if not self._acquire_request_slot(model.model_name):
+                    raise
+        return None
 
     def _translate(
             self,
@@ -298,15 +410,13 @@ class TranslationManager:
 
     def _get_model_response(self, model: GenerativeModel, prompt: str) -> Any:
         """Get a response from the model with timeout handling."""
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(model.generate_content, prompt)
-            return future.result(timeout=180)
+        return model.generate_content(prompt, request_options={"timeout": 180})
 
     def translate_text(self, text: Optional[str], prompt_style: PromptStyle) -> str:
         """Translate a single text snippet using the primary model."""
         if not text:
             return ""
-        return self._translate(self.model_manager.primary_model, text, None, prompt_style) or ""
+        return self._translate(self.model_manager.primary_model, text, None, PromptStyle(prompt_style)) or ""
 
     def translate_chunk(self, chunks: List[str], prompt_style: PromptStyle) -> List[str]:
         """Translate a list of text chunks using the primary model.
@@ -322,70 +432,57 @@ class TranslationManager:
             logging.error("Failed to split text into chunks")
             return []
 
+        prompt_style = PromptStyle(prompt_style)
         translated_chunks = []
         batch_size = self.model_manager.primary_batch_size
-        progress_data = self.progress_tracker.load_progress()
         model = self.model_manager.primary_model
         model_name = model.model_name
 
         # Convert chunks to tasks for consistent processing
-        chunk_tasks = []
-        for i, chunk in enumerate(chunks):
-            chunk_tasks.append(TranslationTask(f"chunk_{i}", chunk))
+        chunk_tasks = deque(TranslationTask(f"chunk_{i}", chunk) for i, chunk in enumerate(chunks))
 
         batch_index = 0
-        while chunk_tasks and not self._stop_requested:
-            # Prepare batch similar to _prepare_batch
-            self.rate_limiter.enforce_rate_limit(
-                progress_data,
-                len(chunk_tasks),
-                batch_size,
-                model_name
-            )
-
-            batch = chunk_tasks[:batch_size]
-            chunk_tasks = chunk_tasks[batch_size:]
+        while chunk_tasks and not self._stop_event.is_set():
+            batch = [chunk_tasks.popleft() for _ in range(min(batch_size, len(chunk_tasks)))]
 
             logging.info("Processing chunk batch %d with %d chunks", batch_index + 1, len(batch))
 
-            # Process batch with ThreadPoolExecutor
-            with ThreadPoolExecutor(max_workers=len(batch)) as executor:
-                future_to_task = {
-                    executor.submit(
-                        self._translate,
-                        model=model,
-                        raw_text=task.content,
-                        additional_info=None,
-                        prompt_style=prompt_style
-                    ): task for task in batch
-                }
-
-                for future in as_completed(future_to_task):
-                    task = future_to_task[future]
-                    try:
-                        translated_chunk = future.result()
-                        if translated_chunk:
-                            translated_chunks.append(translated_chunk)
-                        else:
-                            logging.warning(f"Empty translation result for chunk {task.filename}")
-                    except Exception as e:
-                        logging.error(f"Error translating chunk {task.filename}: {str(e)}")
-
-            # Update model-specific rate limiting information
-            model_rate_limits = progress_data.get("model_rate_limits", {})
-            if model_name not in model_rate_limits:
-                model_rate_limits[model_name] = {"last_batch_time": 0, "last_batch_size": 0}
-
-            model_rate_limits[model_name].update({
-                "last_batch_time": time.time(),
-                "last_batch_size": len(batch)
-            })
-            progress_data["model_rate_limits"] = model_rate_limits
-            self.progress_tracker.save_progress(progress_data)
+            # Process batch on the model's worker pool
+            executor = self._get_executor(model_name, batch_size)
+            if executor is None:
+                break
+            future_to_task = {}
+            for task in batch:
+                if not self._acquire_request_slot(model_name):
+                    break
+                future = self._submit(
+                    executor,
+                    self._translate_with_backoff,
+                    model=model,
+                    raw_text=task.content,
+                    prompt_style=prompt_style
+                )
+                if future is None:
+                    break
+                future_to_task[future] = task
+
+            # Returns early on stop() instead of waiting out calls that are still in flight
+            self._wait_for_futures(list(future_to_task))
+            for future, task in future_to_task.items():
+                if not future.done() or future.cancelled():
+                    continue
+                try:
+                    translated_chunk = future.result()
+                    if translated_chunk:
+                        translated_chunks.append(translated_chunk)
+                    else:
+                        logging.warning(f"Empty translation result for chunk {task.filename}")
+                except Exception as e:
+                    logging.error(f"Error translating chunk {task.filename}: {str(e)}")
 
             batch_index += 1
 
-        if self._stop_requested:
+        if self._stop_event.is_set():
             logging.info("Chunk translation cancelled.")
 
         return translated_chunks
@@ -393,13 +490,13 @@ class TranslationManager:
     def stop(self):
         """Stop the translation process."""
         logging.info("Translator stop() called - cancelling all translation operations")
-        self._stop_requested = True
+        self._stop_event.set()
+        self._shutdown_executors()
         
         if self.file_handler:
             try:
-                progress_data = self.progress_tracker.load_progress()
-                progress_data["clean_cancellation"] = True
-                self.progress_tracker.save_progress(progress_data)
+                self.progress_tracker.mark_clean_cancellation()
+                self.progress_tracker.clear_progress()
             except Exception as e:
                 logging.error(f"Error saving cancellation state: {e}")
 
@@ -410,33 +507,34 @@ class TranslationManager:
         batch_size: Optional[int] = None,
     ) -> List[concurrent.futures.Future]:
         """Process a batch of Chinese-specific retry tasks."""
-        executor = ThreadPoolExecutor(max_workers=batch_size)
-        futures = []
-        
-        tasks = self.task_manager.prepare_chinese_retry_tasks(start_chapter, end_chapter)
-        if not tasks:
-            logging.info("No Chinese-containing translations to process")
-            return futures
+        executor = self._get_executor(self.model_manager.lite_model.model_name, batch_size)
+        if executor is None:
+            return []
 
         progress_data = self.progress_tracker.load_progress()
-        retry_lock = Lock()
+        tasks = deque(self.task_manager.prepare_chinese_retry_tasks(progress_data, start_chapter, end_chapter))
+        if not tasks:
+            logging.info("No Chinese-containing translations to process")
+            return []
 
         batch_index = 0
-        while tasks and not self._stop_requested:
-            self.rate_limiter.enforce_rate_limit(
-                progress_data, len(tasks), batch_size, 
-                self.model_manager.lite_model.model_name
-            )
-            
-            batch = tasks[:batch_size]
-            if not batch:
+        in_flight = set()
+        while tasks and not self._stop_event.is_set():
+            # Like the regular phase, queue at most one batch ahead of the running one
+            while len(in_flight) > batch_size and not self._stop_event.is_set():
+                _, in_flight = concurrent.futures.wait(in_flight, timeout=1.0, return_when=FIRST_COMPLETED)
+            if self._stop_event.is_set():
                 break
-                
+
+            batch = [tasks.popleft() for _ in range(min(batch_size, len(tasks)))]
+
             logging.info("Processing Chinese retry batch %d with %d tasks", batch_index+1, len(batch))
-            logging.info(f"Chinese retry tasks in this batch: {[task.filename for task in batch]}")
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("Chinese retry tasks in this batch: %s", [task.filename for task in batch])
 
             batch_futures = [
-                executor.submit(
+                self._submit(
+                    executor,
                     self._process_chinese_retry_task,
                     task,
                     progress_data,
@@ -444,26 +542,12 @@ class TranslationManager:
                 )
                 for task in batch
             ]
-            
-            futures.extend(batch_futures)
-            tasks = tasks[batch_size:]  # Remove processed tasks
+            batch_futures = [future for future in batch_futures if future is not None]
+
+            in_flight.update(batch_futures)
             batch_index += 1
-            
-            # Update model-specific rate limiting information
-            model_rate_limits = progress_data.get("model_rate_limits", {})
-            model_name = self.model_manager.lite_model.model_name
-            if model_name not in model_rate_limits:
-                model_rate_limits[model_name] = {"last_batch_time": 0, "last_batch_size": 0}
-            
-            model_rate_limits[model_name].update({
-                "last_batch_time": time.time(),
-                "last_batch_size": len(batch)
-            })
-            progress_data["model_rate_limits"] = model_rate_limits
-            self.progress_tracker.save_progress(progress_data)
 
-        executor.shutdown(wait=False)
-        return futures
+        return list(in_flight)
 
     def _process_chinese_retry_task(
             self,
@@ -472,18 +556,17 @@ class TranslationManager:
             prompt_style: PromptStyle,
     ) -> None:
         """Process a translation task that contains Chinese characters specifically."""
-        if self._stop_requested:
+        if self._stop_event.is_set():
             logging.info("Chinese retry task %s cancelled.", task.filename)
             return
             
         model = self.model_manager.lite_model
-                    
+        if not self._acquire_request_slot(model.model_name):
+            logging.info("Chinese retry task %s cancelled.", task.filename)
+            return
+
         try:
-            translated_text = self._translate(
-                model=model,
-                raw_text=task.content,
-                prompt_style=prompt_style,
-            )
+            translated_text = self._translate_with_backoff(model, task.content, prompt_style)
             
             if not translated_text:
                 logging.error("Error processing Chinese retry for %s", task.filename)
@@ -501,6 +584,6 @@ class TranslationManager:
                 
         except Exception as e:
             logging.error("Error processing Chinese retry for %s: %s", task.filename, str(e))
-            if not ("429" in str(e) or "504" in str(e)):
+            if not is_rate_limit_error(e) and "504" not in str(e):
                 self.progress_tracker.mark_translation_failed(task.filename, str(e).lower(), progress_data)
 
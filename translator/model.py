@@ -1,4 +1,6 @@
 import logging
+from threading import Lock
+from typing import Dict, Optional, Tuple
 
 from google.generativeai import GenerativeModel
 import google.generativeai as genai
@@ -6,6 +8,25 @@ import google.generativeai as genai
 from config import settings
 from config.models import ModelConfig, GEMINI_FLASH_LITE_MODEL_CONFIG, GEMINI_PRO_MODEL_CONFIG
 
+# Models are shared by every ModelManager in the process, keyed by name and configuration,
+# and only for the API key in _configured_api_key
+_MODEL_CACHE: Dict[Tuple, GenerativeModel] = {}
+_configured_api_key: Optional[str] = None
+_model_cache_lock = Lock()
+
+
+def _configure_api(api_key: str) -> None:
+    """Configure the SDK, skipping the call when this key is already active.
+
+    Cached models keep the client of the key they were created with, so they are dropped
+    when the key changes. Must be called with _model_cache_lock held.
+    """
+    global _configured_api_key
+    if api_key != _configured_api_key:
+        genai.configure(api_key=api_key)
+        _MODEL_CACHE.clear()
+        _configured_api_key = api_key
+
 
 class ModelManager:
     """Handles model initialization and selection"""
@@ -22,13 +43,22 @@ class ModelManager:
         """Initialize a Gemini model with the given configuration."""
         if not model_config.MODEL_NAME:
             raise ValueError("Model name must be provided")
-        genai.configure(api_key=settings.get_api_key())
-        model = genai.GenerativeModel(
-            model_name=model_config.MODEL_NAME,
-            generation_config=model_config.GENERATION_CONFIG,
-            safety_settings=model_config.SAFETY_SETTINGS
+        key = (
+            model_config.MODEL_NAME,
+            frozenset(model_config.GENERATION_CONFIG.items()),
+            frozenset(model_config.SAFETY_SETTINGS.items()),
         )
-        logging.info("Successfully initialized model: %s", model_config.MODEL_NAME)
+        with _model_cache_lock:
+            _configure_api(settings.get_api_key())
+            model = _MODEL_CACHE.get(key)
+            if model is None:
+                model = genai.GenerativeModel(
+                    model_name=model_config.MODEL_NAME,
+                    generation_config=model_config.GENERATION_CONFIG,
+                    safety_settings=model_config.SAFETY_SETTINGS
+                )
+                _MODEL_CACHE[key] = model
+                logging.info("Successfully initialized model: %s", model_config.MODEL_NAME)
         return model
 
     def select_model_for_task(self, is_retry: bool) -> GenerativeModel:
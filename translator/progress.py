@@ -1,40 +1,119 @@
+import copy
 import logging
+import re
 import time
-from threading import Lock
-from typing import Dict, Optional, List
-
-from config.settings import TRANSLATION_INTERVAL_SECONDS
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from threading import Event, Lock, Timer
+from typing import Dict, Iterable, Iterator, Optional, List, Set, Tuple
+
+from config.settings import (
+    TRANSLATION_INTERVAL_SECONDS, PROGRESS_FLUSH_INTERVAL_SECONDS, PROGRESS_FLUSH_MAX_PENDING
+)
+from file_operations import file_io
 from text_processing.text_processing import normalize_translation
 from translator.file_handler import FileHandler
-from translator.helper import is_in_chapter_range
+from translator.helper import extract_name_numbers, is_in_chapter_range
 from translator.task import FailedTranslationTask, TranslationTask
 
 
-class RateLimiter:
-    """Handles rate limiting for API calls"""
-
-    @staticmethod
-    def enforce_rate_limit(progress_data: Dict, pending_tasks: int, batch_size: int, model_name: str) -> None:
-        """Enforce rate limiting between batches of API calls."""
-        if pending_tasks == 0 or batch_size <= 0:
-            return
-
-        model_rate_limits = progress_data.get("model_rate_limits", {})
+# Error message keyword -> failure type, in priority order
+_FAILURE_TYPES = {
+    'partial_chinese': "partial_chinese",
+    'exceeds_chinese': "exceeds_chinese",
+    'prohibited': "prohibited_content",
+    'copyrighted': "copyrighted_content",
+}
+_FAILURE_KEYWORD_RE = re.compile('|'.join(_FAILURE_TYPES), re.IGNORECASE)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces requests to a steady rate."""
+
+    def __init__(self, capacity: int, refill_rate_per_sec: float):
+        self.capacity = capacity
+        self.refill_rate_per_sec = refill_rate_per_sec
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0  # Monotonic time before which no token is handed out, set by drain()
+        self._lock = Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.refill_rate_per_sec)
+        self._last_refill = now
+
+    def acquire(self, n: int = 1, stop_event: Optional[Event] = None) -> bool:
+        """Take n tokens, waiting until they have been refilled and any pause from drain() is over.
+
+        The wait ends early once stop_event is set; the reserved tokens are then given
+        back and False is returned.
+        """
+        with self._lock:
+            self._refill()
+            # Reserve the tokens now so concurrent callers queue up behind each other
+            self._tokens -= n
+            ready_at = time.monotonic() + max(0.0, -self._tokens / self.refill_rate_per_sec)
+
+        while True:
+            # A drain() while waiting moves the deadline, so it is checked again after every wait
+            with self._lock:
+                wait_time = max(ready_at, self._paused_until) - time.monotonic()
+            if wait_time <= 0:
+                return True
+            if stop_event is None:
+                time.sleep(wait_time)
+            elif stop_event.wait(wait_time):
+                with self._lock:
+                    self._tokens += n
+                return False
+
+    def drain(self, pause_seconds: float = 0.0) -> None:
+        """Empty the bucket, e.g. after the API reported that the quota is exhausted.
+
+        A pause_seconds delay holds back every token, including those already reserved,
+        until that long from now. Concurrent drains extend the pause instead of adding up.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause_seconds)
 
-        # Initialize model data if it doesn't exist
-        if model_name not in model_rate_limits:
-            model_rate_limits[model_name] = {"last_batch_time": 0, "last_batch_size": 0}
-            progress_data["model_rate_limits"] = model_rate_limits
 
-        model_data = model_rate_limits[model_name]
-        last_batch_time = model_data.get("last_batch_time", 0)
-        elapsed = time.time() - last_batch_time
-        remaining = TRANSLATION_INTERVAL_SECONDS - elapsed
+class RateLimiter:
+    """Handles rate limiting for API calls"""
 
-        # Only apply rate limiting if the combined size exceeds batch size
-        if remaining > 0 and (model_data.get("last_batch_size", 0) + pending_tasks) > batch_size:
-            logging.info("Rate limiting for model %s - sleeping %.2f seconds", model_name, remaining)
-            time.sleep(remaining)
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = Lock()
+
+    def register_model(self, model_name: str, requests_per_interval: int) -> None:
+        """Allow a model requests_per_interval calls every TRANSLATION_INTERVAL_SECONDS."""
+        with self._lock:
+            if model_name not in self._buckets:
+                self._buckets[model_name] = TokenBucket(
+                    capacity=requests_per_interval,
+                    refill_rate_per_sec=requests_per_interval / TRANSLATION_INTERVAL_SECONDS,
+                )
+
+    def acquire(self, model_name: str, stop_event: Optional[Event] = None) -> bool:
+        """Block until the model may be sent another request, return False if stop_event was set meanwhile."""
+        bucket = self._buckets.get(model_name)
+        if bucket:
+            return bucket.acquire(stop_event=stop_event)
+        return True
+
+    def drain(self, model_name: str, retry_after: Optional[float] = None) -> None:
+        """Hold back further requests to a model that just hit its quota, for retry_after seconds if given."""
+        bucket = self._buckets.get(model_name)
+        if bucket:
+            if retry_after:
+                logging.info("Rate limit hit for model %s - pausing requests for %.1fs", model_name, retry_after)
+            else:
+                logging.info("Rate limit hit for model %s - draining request budget", model_name)
+            bucket.drain(retry_after or 0.0)
 
 
 class ProgressTracker:
@@ -42,15 +121,82 @@ class ProgressTracker:
 
     def __init__(self, file_handler: FileHandler):
         self.file_handler = file_handler
-        self.retry_lock = Lock()
+        self.retry_lock = Lock()  # Guards the in-memory progress data; not held while progress.json is written
+        self._write_lock = Lock()  # Keeps progress.json writes in order
+        self._progress: Optional[Dict] = None  # In-memory progress data, progress.json is its checkpoint
+        self._pending_progress: Optional[Dict] = None
+        self._pending_saves = 0  # Saves coalesced into the pending write
+        self._last_progress_flush = 0.0
+        self._flush_timer: Optional[Timer] = None  # Trailing write for changes saved between flushes
+        self._last_flushed: Optional[Tuple[Optional[int], Dict]] = None  # (progress.json mtime, data written)
 
     def load_progress(self) -> Dict:
-        """Load the current progress data."""
-        return self.file_handler.load_progress()
+        """Return the current progress data, reading progress.json only when nothing is held in memory."""
+        with self.retry_lock:
+            if self._progress is None:
+                self._progress = self.file_handler.load_progress()
+            return self._progress
+
+    def reload_progress(self) -> Dict:
+        """Write pending changes and read progress.json again, picking up edits made outside this run."""
+        self.clear_progress()
+        return self.load_progress()
+
+    def clear_progress(self) -> None:
+        """Flush pending changes and drop the in-memory progress data."""
+        self.flush_progress()
+        with self.retry_lock:
+            self._progress = None
 
-    def save_progress(self, progress_data: Dict) -> None:
-        """Save the current progress data."""
-        self.file_handler.save_progress(progress_data)
+    def save_progress(self, progress_data: Dict, force: bool = False) -> None:
+        """Save the current progress data, writing it to disk at most every PROGRESS_FLUSH_INTERVAL_SECONDS
+        or once PROGRESS_FLUSH_MAX_PENDING saves have piled up.
+
+        Must be called without retry_lock held.
+        """
+        with self.retry_lock:
+            self._progress = progress_data
+            self._pending_progress = progress_data
+            self._pending_saves += 1
+            remaining = PROGRESS_FLUSH_INTERVAL_SECONDS - (time.monotonic() - self._last_progress_flush)
+            due = force or remaining <= 0 or self._pending_saves >= PROGRESS_FLUSH_MAX_PENDING
+            if not due and self._flush_timer is None:
+                # Make sure the last change of a burst still reaches disk
+                self._flush_timer = Timer(remaining, self.flush_progress)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if due:
+            self.flush_progress()
+
+    def flush_progress(self) -> None:
+        """Write progress data that is still waiting to be saved."""
+        with self._write_lock:
+            # Snapshot under the lock so workers can keep updating progress during the write
+            with self.retry_lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if self._pending_progress is None:
+                    return
+                snapshot = copy.deepcopy(self._pending_progress)
+                self._pending_progress = None
+                self._pending_saves = 0
+                self._last_progress_flush = time.monotonic()
+            # Skip rewriting identical data, unless progress.json was changed by someone else since
+            if self._last_flushed == (self.file_handler.get_progress_mtime(), snapshot):
+                return
+            self.file_handler.save_progress(snapshot)
+            self._last_flushed = (self.file_handler.get_progress_mtime(), snapshot)
+
+    def mark_clean_cancellation(self) -> None:
+        """Record that the run was cancelled cleanly and write it out immediately.
+
+        Workers may still be finishing, so the flag is set under the same lock they use.
+        """
+        progress_data = self.load_progress()
+        with self.retry_lock:
+            progress_data["clean_cancellation"] = True
+        self.save_progress(progress_data, force=True)
 
     def mark_task_as_retried(
             self,
@@ -59,9 +205,10 @@ class ProgressTracker:
     ) -> None:
         """Mark a task as having been retried in the progress data."""
         with self.retry_lock:
-            if "failed_translations" in progress_data and filename in progress_data["failed_translations"]:
-                progress_data["failed_translations"][filename]["retried"] = True
-                self.save_progress(progress_data)
+            if "failed_translations" not in progress_data or filename not in progress_data["failed_translations"]:
+                return
+            progress_data["failed_translations"][filename]["retried"] = True
+        self.save_progress(progress_data)
 
     def mark_translation_failed(
             self,
@@ -73,33 +220,33 @@ class ProgressTracker:
             retried: bool = False,
     ) -> None:
         """Mark a translation as failed in the progress data."""
+        # Determine failure type if not provided
+        if failure_type is None:
+            failure_type = self._categorize_failure(error_message)
+
+        # Create failed task object
+        failed_task = FailedTranslationTask(
+            filename=filename,
+            failure_description=error_message,
+            failure_type=failure_type,
+            timestamp=time.time(),
+            retried=retried,
+        )
+
+        # Each file is handled by a single worker, so the marker can be written outside the lock
+        if store_failure_marker:
+            self._create_failure_marker(filename, failure_type, error_message)
+
         with self.retry_lock:
             # Set up the failed_translations key if it doesn't exist
             if "failed_translations" not in progress_data:
                 progress_data["failed_translations"] = {}
 
-            # Determine failure type if not provided
-            if failure_type is None:
-                failure_type = self._categorize_failure(error_message)
-
-            # Create failed task object
-            failed_task = FailedTranslationTask(
-                filename=filename,
-                failure_description=error_message,
-                failure_type=failure_type,
-                timestamp=time.time(),
-                retried=retried,
-            )
-
             # Update failure information
             progress_data["failed_translations"][filename] = failed_task.to_dict()
-            self.save_progress(progress_data)
-
-            # Create failure marker file
-            if store_failure_marker:
-                self._create_failure_marker(filename, failure_type, error_message)
 
-            logging.warning(f"Translation for {filename} marked as failed: {failure_type}")
+        self.save_progress(progress_data)
+        logging.warning(f"Translation for {filename} marked as failed: {failure_type}")
 
     def handle_translation_success(
             self,
@@ -108,48 +255,49 @@ class ProgressTracker:
             progress_data: Dict,
     ) -> None:
         """Handle a successful translation by saving the result and updating progress."""
-        with self.retry_lock:
-            # Save translated content
-            normalized_text = normalize_translation(translated_text)
-            self.file_handler.save_content_to_file(normalized_text, task.filename, "translation_responses")
+        # Save translated content; only the progress data is shared between workers
+        normalized_text = normalize_translation(translated_text)
+        self.file_handler.save_content_to_file(normalized_text, task.filename, "translation_responses")
 
+        with self.retry_lock:
             # Remove from failures if it was previously marked as failed
-            if "failed_translations" in progress_data and task.filename in progress_data["failed_translations"]:
+            was_failed = ("failed_translations" in progress_data
+                          and task.filename in progress_data["failed_translations"])
+            if was_failed:
                 logging.info(f"Removing {task.filename} from failed translations after successful retry")
                 del progress_data["failed_translations"][task.filename]
-                self.save_progress(progress_data)
 
-            # Delete any failure marker file
-            self.delete_failure_marker(task.filename)
-            logging.info("Successfully translated: %s", task.filename)
+        # Delete any failure marker file
+        self.delete_failure_marker(task.filename)
+
+        if was_failed:
+            self.save_progress(progress_data)
+        logging.info("Successfully translated: %s", task.filename)
 
     def delete_failure_marker(self, filename: str) -> None:
         """Delete a failure marker file for a translation."""
         try:
-            responses_dir = self.file_handler.get_path("translation_responses")
-            marker_file = responses_dir / filename
-            if marker_file.exists():
-                content = self.file_handler.load_content_from_file(filename, "translation_responses")
-                if content and '[TRANSLATION FAILED]' in content:
-                    self.file_handler.delete_file(filename, "translation_responses")
-                    logging.info(f"Deleted failure marker file for {filename}")
+            marker_file = self.file_handler.get_path("translation_responses") / filename
+            try:
+                # Markers start with the sentinel, so the head of the file is enough to tell
+                with marker_file.open('r', encoding='utf-8') as f:
+                    head = f.read(64)
+            except FileNotFoundError:
+                return
+            if '[TRANSLATION FAILED]' in head:
+                marker_file.unlink(missing_ok=True)
+                logging.info(f"Deleted failure marker file for {filename}")
         except Exception as e:
             logging.error(f"Failed to delete failure marker file for {filename}: {e}")
 
     def _categorize_failure(self, error_message: str) -> str:
         """Categorize a failure based on the error message."""
-        error_lower = error_message.lower()
-
-        if 'partial_chinese' in error_lower:
-            return "partial_chinese"
-        elif 'exceeds_chinese' in error_lower:
-            return "exceeds_chinese"
-        elif 'prohibited' in error_lower:
-            return "prohibited_content"
-        elif 'copyrighted' in error_lower:
-            return "copyrighted_content"
-        else:
-            return "generic"
+        found = {keyword.lower() for keyword in _FAILURE_KEYWORD_RE.findall(error_message)}
+        # Keywords are checked in priority order when a message contains several
+        for keyword, failure_type in _FAILURE_TYPES.items():
+            if keyword in found:
+                return failure_type
+        return "generic"
 
     def _create_failure_marker(self, filename: str, failure_type: str, error_message: str) -> None:
         """Create a failure marker file to track failed translations."""
@@ -164,85 +312,151 @@ class ProgressTracker:
 class TaskManager:
     """Manages translation tasks, including preparation and processing"""
 
+    IO_WORKERS = 8  # Threads reading prompt files ahead of the API calls
+    PREFETCH_WINDOW = 16  # Files read ahead of the task currently being handed out
+
     def __init__(self, file_handler: FileHandler):
         self.file_handler = file_handler
+        # Sorted prompt names, kept as long as file_io hands out the same cached listing
+        self._prompt_names_cache: Optional[Tuple[Tuple[Path, ...], List[str]]] = None
+        self._io_executor: Optional[ThreadPoolExecutor] = None  # Shared by every task listing, created on first use
+        self._io_executor_lock = Lock()
+
+    def _get_responses_set(self) -> Set[str]:
+        """Return the names of existing response files."""
+        responses_dir = self.file_handler.get_path("translation_responses")
+        return {path.name for path in file_io.list_txt_files(responses_dir)}
+
+    def _get_sorted_prompt_names(self) -> List[str]:
+        """Return the sorted prompt file names, sorting again only when the directory listing changed."""
+        prompt_files = file_io.list_txt_files(self.file_handler.get_path("prompt_files"))
+        if self._prompt_names_cache is None or self._prompt_names_cache[0] is not prompt_files:
+            names = sorted((path.name for path in prompt_files), key=self._sort_key)
+            self._prompt_names_cache = (prompt_files, names)
+        return self._prompt_names_cache[1]
+
+    @staticmethod
+    def _sort_key(filename: str) -> Tuple[Tuple[int, ...], str]:
+        """Order files numerically by chapter and shard, regardless of zero padding."""
+        return extract_name_numbers(filename), filename
 
     def prepare_new_tasks(
             self,
             start_chapter: Optional[int] = None,
             end_chapter: Optional[int] = None
-    ) -> List[TranslationTask]:
-        """Prepare new translation tasks that haven't been processed yet."""
-        prompts_dir = self.file_handler.get_path("prompt_files")
-        responses_dir = self.file_handler.get_path("translation_responses")
-
-        existing_responses = {f.stem for f in responses_dir.glob("*.txt")}
+    ) -> Iterator[TranslationTask]:
+        """Yield new translation tasks that haven't been processed yet.
+
+        Only the sorted file names are collected upfront; each prompt is read when
+        its task is requested, so memory stays proportional to the batch in flight.
+        """
+        existing_responses = self._get_responses_set()
+
+        # Only include files that haven't been translated yet
+        filenames = [
+            name for name in self._get_sorted_prompt_names()
+            if name not in existing_responses and is_in_chapter_range(name, start_chapter, end_chapter)
+        ]
 
-        tasks = []
-        for f in prompts_dir.glob("*.txt"):
-            # Only include files that haven't been translated yet
-            if (f.stem not in existing_responses and
-                    is_in_chapter_range(f.name, start_chapter, end_chapter)):
-                content = self.file_handler.load_content_from_file(f.name, "prompt_files")
+        # A response may have been written since the listing, e.g. by a concurrent run
+        responses_dir = self.file_handler.get_path("translation_responses")
+        for task in self._iter_loaded_tasks(filenames, "prompt_files"):
+            if not (responses_dir / task.filename).exists():
+                yield task
+
+    def _get_io_executor(self) -> ThreadPoolExecutor:
+        """Return the pool reading prompt files, creating it on first use."""
+        with self._io_executor_lock:
+            if self._io_executor is None:
+                self._io_executor = ThreadPoolExecutor(max_workers=self.IO_WORKERS, thread_name_prefix="prompt-io")
+            return self._io_executor
+
+    def shutdown_io(self, wait: bool = False) -> None:
+        """Shut down the I/O pool, dropping reads that have not started yet."""
+        with self._io_executor_lock:
+            io_executor, self._io_executor = self._io_executor, None
+        if io_executor is not None:
+            io_executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _iter_loaded_tasks(self, filenames: Iterable[str], sub_dir_key: str) -> Iterator[TranslationTask]:
+        """Yield tasks in order while the next files are read concurrently on the I/O pool.
+
+        A bounded window of reads is kept in flight, so loading the following batch
+        overlaps with the API calls of the current one without reading the whole book.
+        The listing ends early if the pool is shut down while it is being consumed.
+        """
+        names = iter(filenames)
+        io_executor = self._get_io_executor()
+
+        def submit(filename: str) -> Tuple[str, Future]:
+            return filename, io_executor.submit(self.file_handler.load_content_from_file, filename, sub_dir_key)
+
+        pending = deque()
+        try:
+            pending.extend(submit(filename) for filename in islice(names, self.PREFETCH_WINDOW))
+            while pending:
+                filename, future = pending.popleft()
+                next_name = next(names, None)
+                if next_name is not None:
+                    pending.append(submit(next_name))
+
+                content = future.result()
                 if content:
-                    tasks.append(TranslationTask(f.name, content))
-
-        return sorted(tasks, key=lambda t: t.filename)
+                    yield TranslationTask(filename, content)
+        except (CancelledError, RuntimeError):
+            # shutdown_io() was called, e.g. by stop(); submit raises RuntimeError once the pool is shut down
+            logging.debug("Stopped loading %s tasks, the I/O pool was shut down", sub_dir_key)
+        finally:
+            # Reads queued ahead of a listing that was abandoned are not needed anymore
+            for _, future in pending:
+                future.cancel()
 
     def prepare_retry_tasks(
             self,
+            progress_data: Dict,
             start_chapter: Optional[int] = None,
             end_chapter: Optional[int] = None
     ) -> List[TranslationTask]:
         """Prepare tasks for retry that previously failed."""
-        progress_data = self.file_handler.load_progress()
         failed_translations = progress_data.get("failed_translations", {})
 
         if not failed_translations:
             logging.info("No failed translations to retry")
             return []
 
-        retry_tasks = []
-        for filename, failure_data in failed_translations.items():
-            failed_task = FailedTranslationTask.from_dict(filename, failure_data)
-            if self._should_skip_retry(failed_task):
-                continue
-
-            if is_in_chapter_range(filename, start_chapter, end_chapter):
-                content = self.file_handler.load_content_from_file(filename, "prompt_files")
-                if content:
-                    retry_tasks.append(TranslationTask(filename, content))
+        filenames = sorted((
+            filename for filename, failure_data in failed_translations.items()
+            if not self._should_skip_retry(FailedTranslationTask.from_dict(filename, failure_data))
+            and is_in_chapter_range(filename, start_chapter, end_chapter)
+        ), key=self._sort_key)
+        retry_tasks = list(self._iter_loaded_tasks(filenames, "prompt_files"))
 
         logging.info(f"Found {len(retry_tasks)} failed translations to retry")
-        return sorted(retry_tasks, key=lambda t: t.filename)
+        return retry_tasks
 
     def prepare_chinese_retry_tasks(
             self,
+            progress_data: Dict,
             start_chapter: Optional[int] = None,
             end_chapter: Optional[int] = None
     ) -> List[TranslationTask]:
         """Prepare tasks specifically for Chinese character retry."""
-        progress_data = self.file_handler.load_progress()
         failed_translations = progress_data.get("failed_translations", {})
 
         if not failed_translations:
             logging.info("No translations with Chinese to retry")
             return []
 
-        retry_tasks = []
-        for filename, failure_data in failed_translations.items():
-            failed_task = FailedTranslationTask.from_dict(filename, failure_data)
-            if self._should_skip_chinese_retry(failed_task):
-                continue
-
-            if is_in_chapter_range(filename, start_chapter, end_chapter):
-                # Use the translated content (with Chinese) instead of the prompt content
-                content = self.file_handler.load_content_from_file(filename, "translation_responses")
-                if content:
-                    retry_tasks.append(TranslationTask(filename, content))
+        filenames = sorted((
+            filename for filename, failure_data in failed_translations.items()
+            if not self._should_skip_chinese_retry(FailedTranslationTask.from_dict(filename, failure_data))
+            and is_in_chapter_range(filename, start_chapter, end_chapter)
+        ), key=self._sort_key)
+        # Use the translated content (with Chinese) instead of the prompt content
+        retry_tasks = list(self._iter_loaded_tasks(filenames, "translation_responses"))
 
         logging.info(f"Found {len(retry_tasks)} translations with Chinese characters to retry")
-        return sorted(retry_tasks, key=lambda t: t.filename)
+        return retry_tasks
 
     def _should_skip_retry(self, failed_task: FailedTranslationTask) -> bool:
         """Determine if a retry should be skipped based on retry count and failure type."""
@@ -259,13 +473,3 @@ class TaskManager:
         if failed_task.failure_type != "partial_chinese":
             return True
         return False
-
-    def has_processed_tasks(self, batch: List[TranslationTask]) -> bool:
-        """Check if any tasks in the batch have already been processed."""
-        responses_dir = self.file_handler.get_path("translation_responses")
-        existing_responses = [f.name for f in responses_dir.glob("*.txt")]
-
-        processed_tasks = [
-            task for task in batch if task.filename in existing_responses
-        ]
-        return len(processed_tasks) > 0
\ No newline at end of file
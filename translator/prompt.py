@@ -4,6 +4,21 @@ from config import prompts
 from config.prompts import PromptStyle
 
 
+_CONTENT_MARKER = "[**NỘI DUNG ĐOẠN VĂN**]"
+
+# (head, tail) wrapped around the text for each style, built once at import instead of on every prompt
+_PROMPT_PARTS = {
+    style: (f"{base_prompt}\n{_CONTENT_MARKER}\n".lstrip(), f"\n{_CONTENT_MARKER}\n{base_prompt}")
+    for style, base_prompt in (
+        (PromptStyle.Modern, prompts.MODERN_PROMPT),
+        (PromptStyle.ChinaFantasy, prompts.CHINA_FANTASY_PROMPT),
+        (PromptStyle.BookInfo, prompts.BOOK_INFO_PROMPT),
+        (PromptStyle.Sentences, prompts.SENTENCES_PROMPT),
+        (PromptStyle.IncompleteHandle, prompts.INCOMPLETE_HANDLE_PROMPT),
+    )
+}
+
+
 class PromptBuilder:
     """Handles building translation prompts"""
 
@@ -13,15 +28,9 @@ class PromptBuilder:
             additional_info: Optional[str],
             prompt_style: PromptStyle
     ) -> str:
-        """Build prompt based on selected style."""
-        base_prompt = {
-            PromptStyle.Modern: prompts.MODERN_PROMPT,
-            PromptStyle.ChinaFantasy: prompts.CHINA_FANTASY_PROMPT,
-            PromptStyle.BookInfo: prompts.BOOK_INFO_PROMPT,
-            PromptStyle.Sentences: prompts.SENTENCES_PROMPT,
-            PromptStyle.IncompleteHandle: prompts.INCOMPLETE_HANDLE_PROMPT,
-        }[PromptStyle(prompt_style)]
-        text = f"[**NỘI DUNG ĐOẠN VĂN**]\n{text.strip()}\n[**NỘI DUNG ĐOẠN VĂN**]"
+        """Build prompt based on selected style; prompt_style must already be a PromptStyle member."""
+        head, tail = _PROMPT_PARTS[prompt_style]
+        prompt = f"{head}{text.strip()}{tail}"
         if additional_info:
-            return f"{base_prompt}\n{text}\n{base_prompt}\n\n{additional_info}".strip()
-        return f"{base_prompt}\n{text}\n{base_prompt}".strip()
+            return f"{prompt}\n\n{additional_info}".rstrip()
+        return prompt.rstrip()